@@ -1,7 +1,10 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncGenerator
+import atexit
 import logging
-from datetime import datetime
-from copy import deepcopy
+import logging.handlers
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 # =========================================================
 # IMPORTS ADK
@@ -11,22 +14,49 @@ from google.adk.models.lite_llm import LiteLlm
 from google.adk.agents import SequentialAgent
 from google.adk.tools import ToolContext
 from google.adk.runners import Runner
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.genai import types 
 from google.adk.sessions import InMemorySessionService
 from google.adk.memory import InMemoryMemoryService
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmResponse, LlmRequest
 from google.adk.tools.base_tool import BaseTool
+import litellm
 
-# (Supposons que vos outils existent dans un module .tools, 
-# sinon je les mocke ici pour que le code soit exécutable et autonome comme l'exemple)
-# from .tools import get_weather, search_scholarships, search_city_info, get_public_holidays
+# Outils réels (asynchrones, httpx) définis dans le module .tools
+from .tools import (
+    get_weather, get_weather_many, search_scholarships, get_public_holidays, search_city_info
+)
+from .cache import (
+    llm_cache_key, get_cached_response, store_response, lookup_answer, store_answer
+)
 
 # Config placeholders (pour respecter le style sans dépendance externe)
 ROOT_MODEL_NAME = "ollama_chat/qwen2.5:7b-instruct"
 TOOL_MODEL_NAME = "ollama_chat/qwen2.5:7b-instruct" 
 
+# NB : LiteLlm.generate_content_async passe déjà par `litellm.acompletion`,
+# les appels modèle ne bloquent donc pas la boucle d'événements (pas de sous-classe).
+
+# Une seule instance par modèle, partagée par tous les agents (LiteLlm ne garde
+# que sa configuration : il peut être réutilisé sans risque entre coroutines).
+_ROOT_LLM = LiteLlm(model=ROOT_MODEL_NAME)
+_TOOL_LLM = LiteLlm(model=TOOL_MODEL_NAME)
+
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Logs non bloquants : les callbacks déposent les records dans une file,
+# un thread dédié (QueueListener) se charge de l'écriture sur la console.
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter("[⏰ %(asctime)s] %(message)s", datefmt="%H:%M:%S"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _console_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.propagate = False
 
 # =========================================================
 # 1. SERVICES
@@ -38,34 +68,84 @@ memory_service = InMemoryMemoryService()
 # 2. CALLBACKS
 # =========================================================
 
+# Réponse renvoyée quand un agent est skippé (construite une seule fois)
+_SKIP_CONTENT = types.Content(parts=[types.Part(text="Agent skipped.")], role="model")
+
 # --- CALLBACK 1: LOGGING & STATE CHECK (Before Agent) ---
 def check_and_log_agent_entry(callback_context: CallbackContext) -> Optional[types.Content]:
     """
     Log l'entrée dans l'agent et met à jour les stats utilisateur en session.
     Peut aussi skipper un agent si une condition est remplie.
     """
-    agent_name = callback_context.agent_name
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    current_state = callback_context.state.to_dict()
+    state = callback_context.state
+
+    # Exemple de logique de skip (similaire au code Hotel)
+    if state.get("skip_processing", False):
+        logger.info("[Callback] Skipping agent %s due to skip_processing=True", callback_context.agent_name)
+        return _SKIP_CONTENT
 
-    print(f"\n{'🟡'*25}")
-    print(f"[⏰ {timestamp}] Callback: Entering agent '{agent_name}'")
-    
     # Mise à jour des compteurs (State Management)
-    call_count = current_state.get("user:agent_call_count", 0) + 1
-    callback_context.state["user:agent_call_count"] = call_count
-    callback_context.state["temp:current_agent"] = agent_name
+    call_count = state.get("user:agent_call_count", 0) + 1
+    state["user:agent_call_count"] = call_count
+    state["temp:current_agent"] = callback_context.agent_name
+
+    # Formatage paresseux : rien n'est construit si le niveau INFO est désactivé
+    logger.info(
+        "%s Callback: Entering agent '%s' | 📊 State: call_count=%d",
+        '🟡' * 3, callback_context.agent_name, call_count
+    )
     
-    print(f"📊 State: call_count={call_count}")
+    return None
 
-    # Exemple de logique de skip (similaire au code Hotel)
-    if current_state.get("skip_processing", False):
-        print(f"[Callback] Skipping agent {agent_name} due to skip_processing=True")
-        return types.Content(
-            parts=[types.Part(text=f"Agent {agent_name} skipped.")],
-            role="model"
-        )
-    
+# --- CALLBACK 1b: ANSWER CACHE (Before / After Root Agent) ---
+
+# Clés de state (temp: = limitées à l'invocation, jamais persistées)
+_ANSWER_QUERY_KEY = "temp:answer_cache_query"
+_ANSWER_FINAL_KEY = "temp:answer_cache_final"
+_ANSWER_SKIP_KEY = "temp:answer_cache_skip"
+
+# La météo "actuelle" est périmée en quelques heures : jamais mise en cache
+_UNCACHEABLE_TOOLS = {"get_weather_tool", "get_weather_many_tool"}
+
+def _content_text(content: Optional[types.Content]) -> str:
+    """Concatène les parties texte d'un message."""
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text)
+
+def _is_first_turn(callback_context: CallbackContext) -> bool:
+    """Vrai si le message courant est le premier message utilisateur de la session."""
+    events = callback_context.session.events if callback_context.session else []
+    user_turns = sum(1 for event in events if event.author == "user")
+    return user_turns <= 1
+
+def answer_cache_lookup(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Renvoie directement la réponse déjà donnée à la même question (même utilisateur,
+    même formulation normalisée) : ni routage ni pipeline.
+
+    Seul le premier tour d'une session est concerné : une relance ("et en Allemagne ?",
+    "oui") dépend de l'historique et ne doit jamais rejouer une réponse sans rapport.
+    """
+    query = _content_text(callback_context.user_content)
+    if not query or not _is_first_turn(callback_context):
+        return None
+
+    cached = lookup_answer(callback_context.agent_name, callback_context.user_id, query)
+    if cached is not None:
+        logger.info("⚡ Answer cache hit (%s)", callback_context.agent_name)
+        return types.Content(parts=[types.Part(text=cached)], role="model")
+
+    callback_context.state[_ANSWER_QUERY_KEY] = query
+    return None
+
+def answer_cache_store(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Enregistre la réponse finale de l'invocation, sauf si un outil a échoué ou concerne la météo."""
+    state = callback_context.state
+    query = state.get(_ANSWER_QUERY_KEY)
+    final_text = state.get(_ANSWER_FINAL_KEY)
+    if query and final_text and not state.get(_ANSWER_SKIP_KEY, False):
+        store_answer(callback_context.agent_name, callback_context.user_id, query, final_text)
     return None
 
 # --- CALLBACK 2: PROMPT MODIFIER (Before Model) ---
@@ -74,26 +154,65 @@ def simple_before_model_modifier(
 ) -> Optional[LlmResponse]:
     """Inspecte ou modifie la requête LLM avant envoi."""
     agent_name = callback_context.agent_name
-    timestamp = datetime.now().strftime("%H:%M:%S")
 
-    # Récupération du dernier message utilisateur pour logging
-    last_user_msg = ""
-    if llm_request.contents and llm_request.contents[-1].role == 'user':
-         if llm_request.contents[-1].parts:
-            last_user_msg = llm_request.contents[-1].parts[0].text
-
-    print(f"\n{'🔵'*25}")
-    print(f"[⏰ {timestamp}] Before Model ({agent_name})")
-    print(f"📝 User Input: {last_user_msg[:50]}..." if last_user_msg else "📝 User Input: Empty")
+    # Le garde évite d'extraire le dernier message quand INFO est désactivé
+    if logger.isEnabledFor(logging.INFO):
+        # Récupération du dernier message utilisateur pour logging
+        last_user_msg = ""
+        if llm_request.contents and llm_request.contents[-1].role == 'user':
+             if llm_request.contents[-1].parts:
+                last_user_msg = llm_request.contents[-1].parts[0].text
+
+        logger.info("%s Before Model (%s)", '🔵' * 3, agent_name)
+        logger.info("📝 User Input: %s", f"{last_user_msg[:50]}..." if last_user_msg else "Empty")
+
+    # Cache de réponses : même agent + même prompt -> on court-circuite le LLM
+    cache_key = llm_cache_key(agent_name, llm_request)
+    callback_context.state["temp:llm_cache_key"] = cache_key
+    cached = get_cached_response(cache_key)
+    if cached is not None:
+        logger.info("⚡ Cache hit (%s)", agent_name)
+        callback_context.state[_ANSWER_FINAL_KEY] = cached
+        return LlmResponse(
+            content=types.Content(parts=[types.Part(text=cached)], role="model")
+        )
     
     return None # On laisse passer la requête
 
+# --- CALLBACK 2b: CACHE WRITER (After Model) ---
+def cache_model_response(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """Enregistre les réponses texte finales du LLM dans le cache."""
+    cache_key = callback_context.state.get("temp:llm_cache_key")
+    content = llm_response.content
+    if not cache_key or llm_response.partial or not content or not content.parts:
+        return None
+
+    # On ne met en cache que du texte pur (pas d'appel d'outil à rejouer)
+    if any(part.text is None for part in content.parts):
+        return None
+
+    text = "".join(part.text for part in content.parts)
+    store_response(cache_key, text)
+    # Dernière réponse texte de l'invocation : candidate pour le cache de réponses
+    callback_context.state[_ANSWER_FINAL_KEY] = text
+    return None
+
 # --- CALLBACK 3: TOOL INSPECTOR (After Tool) ---
 def simple_after_tool_modifier(
     tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Dict
 ) -> Optional[Dict]:
     """Inspecte le résultat des outils."""
-    print(f"[Callback] After tool '{tool.name}' executed.")
+    logger.info("[Callback] After tool '%s' executed.", tool.name)
+
+    # Une réponse construite sur une erreur ou sur la météo ne doit pas être rejouée
+    failed = isinstance(tool_response, dict) and (
+        "error" in tool_response or tool_response.get("status") == "error"
+    )
+    if failed or tool.name in _UNCACHEABLE_TOOLS:
+        tool_context.state[_ANSWER_SKIP_KEY] = True
+
     # On pourrait modifier la réponse ici si besoin, comme dans l'exemple Hotel
     return None
 
@@ -101,27 +220,48 @@ def simple_after_tool_modifier(
 # 3. TOOLS (Wrappers pour standardisation)
 # =========================================================
 
-# Ici je définis des wrappers pour que l'architecture soit autonome
-# Dans votre vrai code, remplacez le contenu par vos appels réels
-
-def get_weather_tool(city: str) -> dict:
-    """Mock weather tool."""
-    return {"city": city, "temp": "25C", "condition": "Sunny", "status": "success"}
-
-def get_public_holidays_tool(country_code: str, year: int = 2025) -> dict:
-    """Mock holiday tool."""
-    return {"country": country_code, "holidays": ["New Year", "Independence Day"], "status": "success"}
-
-def search_scholarships_tool(country: str, field: str, level: str) -> dict:
-    """Mock scholarship search."""
-    # Simulation de retour API
+# Wrappers asynchrones : l'ADK attend nativement les outils coroutine,
+# ce qui permet de chevaucher les appels réseau de plusieurs outils.
+# Quand le LLM émet plusieurs FunctionCalls dans une même réponse, l'ADK les
+# exécute déjà en parallèle (asyncio.gather) : il n'y a pas d'option à activer
+# sur `Agent`, il suffit que chaque outil soit une coroutine non bloquante.
+
+async def get_weather_tool(city: str) -> dict:
+    """Météo actuelle d'une ville (Open-Meteo)."""
+    weather = await get_weather(city)
+    weather["status"] = "error" if "error" in weather else "success"
+    return weather
+
+async def get_weather_many_tool(cities: List[str]) -> dict:
+    """Météo actuelle de plusieurs villes en un seul appel (requêtes concurrentes)."""
+    weathers = await get_weather_many(cities)
+    status = "error" if any("error" in weather for weather in weathers) else "success"
+    return {"cities": weathers, "status": status}
+
+async def get_public_holidays_tool(country: str, year: int = 2025) -> dict:
+    """Jours fériés d'un pays (Nager.Date), à partir de son nom ou de son code ISO."""
+    holidays = await get_public_holidays(country, year)
+    status = "error" if any("error" in holiday for holiday in holidays) else "success"
+    return {"country": country, "holidays": holidays, "status": status}
+
+async def search_city_info_tool(city: str) -> dict:
+    """Informations touristiques sur une ville (recherche web Tavily)."""
+    info = await search_city_info(city)
+    info["status"] = "error" if "error" in info else "success"
+    return info
+
+async def search_scholarships_tool(
+    country: str, field: str, level: str, tool_context: ToolContext
+) -> dict:
+    """Recherche de bourses (API + données de secours)."""
+    # search_scholarships renvoie déjà les bourses classées par montant (Top 5)
+    scholarships = await search_scholarships(country, field, level)
+    tool_context.state["scholarship_results"] = scholarships
+    # L'agent de résumé reçoit directement le Top 3
+    tool_context.state["ranked_scholarships"] = scholarships[:3]
     return {
-        "status": "success", 
-        "data": [
-            {"name": "Gov Grant A", "amount": "5000$", "deadline": "2025-12-01", "req": "GPA 3.0"},
-            {"name": "Tech Future B", "amount": "2000$", "deadline": "2025-06-01", "req": "GPA 3.5"},
-            {"name": "Research Fell C", "amount": "10000$", "deadline": "2025-09-01", "req": "PhD Only"}
-        ]
+        "status": "success",
+        "data": scholarships
     }
 
 # =========================================================
@@ -132,13 +272,17 @@ def search_scholarships_tool(country: str, field: str, level: str) -> dict:
 
 weather_agent = Agent(
     name="weather_agent",
-    model=LiteLlm(model=TOOL_MODEL_NAME),
-    description="Donne la météo et suggère des activités.",
-    tools=[get_weather_tool],
+    model=_TOOL_LLM,
     before_model_callback=simple_before_model_modifier,
+    after_model_callback=cache_model_response,
+    description="Donne la météo et suggère des activités.",
+    tools=[get_weather_tool, get_weather_many_tool],
+    after_tool_callback=simple_after_tool_modifier,
     instruction="""
     Tu es un expert météo.
     1. Utilise `get_weather_tool` avec la ville demandée.
+       Si plusieurs villes sont demandées (ex: un itinéraire), appelle UNE SEULE FOIS
+       `get_weather_many_tool` avec la liste des villes.
     2. Donne la météo actuelle.
     3. Suggère une activité adaptée (ex: 'Plage' si soleil, 'Musée' si pluie).
     """
@@ -146,24 +290,36 @@ weather_agent = Agent(
 
 holiday_agent = Agent(
     name="holiday_agent",
-    model=LiteLlm(model=TOOL_MODEL_NAME),
+    model=_TOOL_LLM,
+    before_model_callback=simple_before_model_modifier,
+    after_model_callback=cache_model_response,
     description="Donne les jours fériés.",
     tools=[get_public_holidays_tool],
+    after_tool_callback=simple_after_tool_modifier,
     instruction="""
-    1. Extrais le pays de la demande.
-    2. Convertis-le en code ISO 2 lettres (ex: Maroc -> MA, France -> FR).
-    3. Appelle `get_public_holidays_tool`.
-    4. Affiche la liste des jours fériés de manière claire.
+    1. Appelle `get_public_holidays_tool` avec le nom du pays tel quel (ex: "Maroc").
+       Si plusieurs pays sont demandés, émets tous les appels dans la même réponse
+       (ils seront exécutés en parallèle).
+       Si l'outil répond que le pays est introuvable ("not found"), rappelle-le UNE fois
+       avec le code ISO 2 lettres du pays (ex: Qatar -> QA, Algérie -> DZ).
+    2. Affiche la liste des jours fériés de manière claire.
     """
 )
 
 city_info_agent = Agent(
     name="city_info_agent",
-    model=LiteLlm(model=ROOT_MODEL_NAME), # Modèle plus 'bavard' pour le texte
+    model=_ROOT_LLM, # Modèle plus 'bavard' pour le texte
+    before_model_callback=simple_before_model_modifier,
+    after_model_callback=cache_model_response,
     description="Donne des infos sur une ville.",
+    tools=[search_city_info_tool],
+    after_tool_callback=simple_after_tool_modifier,
     instruction="""
     Tu es un guide touristique.
-    Donne 3 faits intéressants et culturels sur la ville demandée par l'utilisateur.
+    1. Appelle `search_city_info_tool` avec la ville demandée.
+    2. Donne 3 faits intéressants et culturels sur cette ville, en t'appuyant sur le résumé
+       et les sources renvoyés par l'outil.
+       Si l'outil renvoie une erreur, utilise tes propres connaissances.
     """
 )
 
@@ -172,7 +328,9 @@ city_info_agent = Agent(
 # Étape 1 : Recherche
 scholarship_search_agent = Agent(
     name="scholarship_search_agent",
-    model=LiteLlm(model=TOOL_MODEL_NAME),
+    model=_TOOL_LLM,
+    before_model_callback=simple_before_model_modifier,
+    after_model_callback=cache_model_response,
     description="Recherche bourses.",
     tools=[search_scholarships_tool],
     after_tool_callback=simple_after_tool_modifier, # Check results
@@ -181,36 +339,23 @@ scholarship_search_agent = Agent(
     Appelle `search_scholarships_tool`.
     
     IMPORTANT :
-    Récupère la liste des bourses retournée par l'outil.
-    Écris cette liste brute dans `session.state.scholarship_results`.
+    L'outil enregistre lui-même dans le state la liste déjà classée par montant
+    (`scholarship_results`) et son Top 3 (`ranked_scholarships`).
+    Contente-toi de confirmer brièvement le nombre de bourses trouvées.
     """
 )
 
-# Étape 2 : Ranking
-scholarship_ranking_agent = Agent(
-    name="scholarship_ranking_agent",
-    model=LiteLlm(model=TOOL_MODEL_NAME),
-    description="Classement bourses.",
-    instruction="""
-    Lis `session.state.scholarship_results`.
-    
-    Tâche :
-    1. Trie les bourses par Montant (du plus gros au plus petit).
-    2. Sélectionne le Top 3.
-    3. Formate une liste propre.
-    
-    Écris ce Top 3 formaté dans `session.state.ranked_scholarships`.
-    """
-)
-
-# Étape 3 : Résumé / Conseil
+# Étape 2 : Résumé / Conseil (le classement est déjà fait par l'outil de recherche)
 scholarship_summary_agent = Agent(
     name="scholarship_summary_agent",
-    model=LiteLlm(model=ROOT_MODEL_NAME),
+    model=_ROOT_LLM,
+    before_model_callback=simple_before_model_modifier,
+    after_model_callback=cache_model_response,
     description="Conseiller final.",
     instruction="""
     Tu es un conseiller d'orientation bienveillant.
-    Lis `session.state.ranked_scholarships`.
+    Voici les meilleures bourses, déjà classées par montant :
+    {ranked_scholarships?}
     
     Présente ces opportunités à l'étudiant avec un ton encourageant.
     Explique pourquoi c'est une bonne opportunité pour lui.
@@ -223,10 +368,9 @@ scholarship_pipeline = SequentialAgent(
     name="scholarship_pipeline",
     sub_agents=[
         scholarship_search_agent,
-        scholarship_ranking_agent,
         scholarship_summary_agent
     ],
-    description="Workflow complet : Recherche -> Classement -> Conseil pour bourses d'études."
+    description="Workflow complet : Recherche + Classement -> Conseil pour bourses d'études."
 )
 
 # =========================================================
@@ -235,10 +379,13 @@ scholarship_pipeline = SequentialAgent(
 
 root_agent = Agent(
     name="root_agent",
-    model=LiteLlm(model=ROOT_MODEL_NAME),
+    model=_ROOT_LLM,
+    before_model_callback=simple_before_model_modifier,
+    after_model_callback=cache_model_response,
     description="Routeur Principal Salah Travel System.",
     sub_agents=[weather_agent, holiday_agent, city_info_agent, scholarship_pipeline],
-    before_agent_callback=check_and_log_agent_entry, # Global logging entry point
+    before_agent_callback=[check_and_log_agent_entry, answer_cache_lookup], # Global logging entry point + cache de réponses
+    after_agent_callback=answer_cache_store,
     instruction="""
     Tu es l'assistant principal du système "Salah Travel & Study".
 
@@ -260,5 +407,78 @@ root_agent = Agent(
     """
 )
 
+# =========================================================
+# 6. WARMUP DES MODÈLES
+# =========================================================
+
+_WARMUP_TIMEOUT = 5  # secondes
+
+def _warmup_model(model_name: str) -> None:
+    """Envoie un ping d'1 token pour que Ollama charge le modèle en mémoire."""
+    try:
+        litellm.completion(
+            model=model_name,
+            messages=[{"role": "user", "content": "hi"}],
+            max_tokens=1,
+            # Le thread est joint à la sortie de l'interpréteur : ne jamais attendre longtemps
+            timeout=_WARMUP_TIMEOUT,
+        )
+    except Exception as e:
+        logger.warning("Warmup failed for %s: %s", model_name, e)
+
+# Chargement à froid en arrière-plan (sans bloquer l'import), désactivable avec PREWARM=0
+if os.getenv("PREWARM", "1") == "1":
+    _models = {ROOT_MODEL_NAME, TOOL_MODEL_NAME}
+    _warmup_executor = ThreadPoolExecutor(max_workers=len(_models), thread_name_prefix="warmup")
+    for _model in _models:
+        _warmup_executor.submit(_warmup_model, _model)
+    _warmup_executor.shutdown(wait=False)
+
+# =========================================================
+# 7. EXÉCUTION EN STREAMING
+# =========================================================
+
+APP_NAME = "Salah_agent"
+
+# En mode SSE, LiteLlm appelle `litellm.acompletion(stream=True)` et l'ADK émet
+# des événements partiels : le texte s'affiche dès le premier token.
+STREAMING_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+runner = Runner(
+    agent=root_agent,
+    app_name=APP_NAME,
+    session_service=session_service,
+    memory_service=memory_service,
+)
+
+async def stream_reply(user_id: str, session_id: str, message: str) -> AsyncGenerator[str, None]:
+    """Fait tourner le système pour `message` et renvoie le texte au fil de sa génération."""
+    session = await session_service.get_session(
+        app_name=APP_NAME, user_id=user_id, session_id=session_id
+    )
+    if session is None:
+        await session_service.create_session(
+            app_name=APP_NAME, user_id=user_id, session_id=session_id
+        )
+
+    new_message = types.Content(role="user", parts=[types.Part(text=message)])
+    streamed = False
+    async for event in runner.run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=new_message,
+        run_config=STREAMING_RUN_CONFIG,
+    ):
+        text = _content_text(event.content)
+        if event.partial:
+            streamed = True
+            if text:
+                yield text
+        else:
+            # Réponse non streamée (cache, agent sans LLM) : on l'envoie d'un bloc
+            if text and not streamed and event.author != "user":
+                yield text
+            streamed = False
+
 # Export pour l'exécution
 agent = root_agent
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""
+Cache module for multi-agent AI system.
+Stores final LLM text responses so identical prompts skip the model call,
+and final answers per user question so a repeated question skips the whole run.
+"""
+import atexit
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    from google.adk.models import LlmRequest
+
+
+_CACHE_DIR = os.path.expanduser(os.getenv("SALAH_CACHE_DIR", "~/.salah_cache"))
+
+# In-memory LRU in front of an on-disk sqlite table shared across runs
+_MAX_ENTRIES = 1024
+_MAX_DISK_ENTRIES = 10_000
+_LLM_CACHE_TTL = float(os.getenv("SALAH_LLM_CACHE_TTL", str(24 * 60 * 60)))
+
+# Pruning sorts the table: done when the store opens, then once every N writes
+_PRUNE_EVERY = 100
+# Callbacks run on the event loop: never wait long for another process's lock
+_BUSY_TIMEOUT = 0.05
+
+# key -> (response text, created_at)
+_memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+_responses_db: Optional[sqlite3.Connection] = None
+_responses_db_disabled = False
+_responses_writes = 0
+
+
+def _connect(filename: str) -> sqlite3.Connection:
+    """
+    Open a sqlite file of the cache directory.
+
+    sqlite locks the file itself, so several processes (e.g. `adk web` reloads)
+    can share the cache; WAL lets readers proceed while another process writes.
+    The busy timeout is kept tiny: a locked write is dropped rather than
+    stalling the event loop.
+    """
+    os.makedirs(_CACHE_DIR, exist_ok=True)
+    db = sqlite3.connect(os.path.join(_CACHE_DIR, filename), timeout=_BUSY_TIMEOUT)
+    db.execute("PRAGMA journal_mode=WAL")
+    return db
+
+
+def _open_responses_db() -> Optional[sqlite3.Connection]:
+    """Open the response store lazily, dropping expired rows; disable persistence if unusable."""
+    global _responses_db, _responses_db_disabled
+    if _responses_db is None and not _responses_db_disabled:
+        try:
+            db = _connect("llm_responses.sqlite")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                "key TEXT PRIMARY KEY, response TEXT, created_at REAL)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS llm_responses_created_at ON llm_responses (created_at)"
+            )
+            _prune_responses(db)
+            _responses_db = db
+        except sqlite3.Error:
+            _responses_db_disabled = True
+    return _responses_db
+
+
+def _prune_responses(db: sqlite3.Connection) -> None:
+    """Delete expired rows and keep at most `_MAX_DISK_ENTRIES` of the newest ones."""
+    db.execute(
+        "DELETE FROM llm_responses WHERE created_at < ?", (time.time() - _LLM_CACHE_TTL,)
+    )
+    db.execute(
+        "DELETE FROM llm_responses WHERE key NOT IN ("
+        "SELECT key FROM llm_responses ORDER BY created_at DESC LIMIT ?)",
+        (_MAX_DISK_ENTRIES,),
+    )
+    db.commit()
+
+
+def _close_responses_db() -> None:
+    """Close the response store when the interpreter shuts down."""
+    if _responses_db is not None:
+        _responses_db.close()
+
+
+atexit.register(_close_responses_db)
+
+
+def llm_cache_key(agent_name: str, llm_request: "LlmRequest") -> str:
+    """
+    Hash everything that determines the model output.
+
+    Args:
+        agent_name: Name of the agent issuing the request
+        llm_request: Request about to be sent to the model
+
+    Returns:
+        Hex digest identifying (agent, model, instruction, conversation)
+    """
+    system_instruction = llm_request.config.system_instruction if llm_request.config else None
+    payload = {
+        "agent": agent_name,
+        "model": llm_request.model,
+        "system": str(system_instruction),
+        "contents": [c.model_dump(mode="json", exclude_none=True) for c in llm_request.contents],
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def get_cached_response(key: str) -> Optional[str]:
+    """Return the cached response text for `key`, or None on a miss or once expired."""
+    now = time.time()
+    if key in _memory:
+        text, created_at = _memory[key]
+        if now - created_at < _LLM_CACHE_TTL:
+            _memory.move_to_end(key)
+            return text
+        del _memory[key]
+
+    db = _open_responses_db()
+    if db is None:
+        return None
+    try:
+        row = db.execute(
+            "SELECT response, created_at FROM llm_responses WHERE key = ? AND created_at >= ?",
+            (key, now - _LLM_CACHE_TTL),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    _remember(key, row[0], row[1])
+    return row[0]
+
+
+def store_response(key: str, text: str) -> None:
+    """Record a fresh model response in memory and on disk."""
+    created_at = time.time()
+    _remember(key, text, created_at)
+    db = _open_responses_db()
+    if db is None:
+        return
+    global _responses_writes
+    try:
+        db.execute(
+            "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?)", (key, text, created_at)
+        )
+        db.commit()
+        _responses_writes += 1
+        if _responses_writes % _PRUNE_EVERY == 0:
+            _prune_responses(db)
+    except sqlite3.Error:
+        pass  # Another process holds the lock: the in-memory entry is enough
+
+
+def _remember(key: str, text: str, created_at: float) -> None:
+    """Insert into the in-memory LRU, evicting the oldest entry when full."""
+    _memory[key] = (text, created_at)
+    _memory.move_to_end(key)
+    if len(_memory) > _MAX_ENTRIES:
+        _memory.popitem(last=False)
+
+
+# =========================================================
+# Answer cache (agent, user, normalized query) -> final answer
+# =========================================================
+
+# Answers (holidays, scholarships...) go stale: entries expire after a day by default
+_ANSWER_CACHE_TTL = float(os.getenv("SALAH_ANSWER_CACHE_TTL", str(24 * 60 * 60)))
+_MAX_ANSWER_ENTRIES = 10_000
+
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+_answers_db: Optional[sqlite3.Connection] = None
+_answers_db_disabled = False
+_answers_writes = 0
+
+
+def normalize_query(text: str) -> str:
+    """
+    Lowercase, strip accents and collapse punctuation/whitespace.
+
+    Word order is kept: "Météo à Paris, pas à Lyon" and "Météo à Lyon, pas à Paris"
+    are different questions.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_WORD_PATTERN.sub(" ", text).strip()
+
+
+def _open_answers_db() -> Optional[sqlite3.Connection]:
+    """Open the answer store lazily, dropping expired rows; disable it if unusable."""
+    global _answers_db, _answers_db_disabled
+    if _answers_db is None and not _answers_db_disabled:
+        try:
+            db = _connect("answers.sqlite")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "agent TEXT, user_id TEXT, normalized TEXT, response TEXT, created_at REAL, "
+                "PRIMARY KEY (agent, user_id, normalized))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS answers_created_at ON answers (created_at)")
+            _prune_answers(db)
+            _answers_db = db
+        except sqlite3.Error:
+            _answers_db_disabled = True
+    return _answers_db
+
+
+def _prune_answers(db: sqlite3.Connection) -> None:
+    """Delete expired answers and keep at most `_MAX_ANSWER_ENTRIES` of the newest ones."""
+    db.execute("DELETE FROM answers WHERE created_at < ?", (time.time() - _ANSWER_CACHE_TTL,))
+    db.execute(
+        "DELETE FROM answers WHERE rowid NOT IN ("
+        "SELECT rowid FROM answers ORDER BY created_at DESC LIMIT ?)",
+        (_MAX_ANSWER_ENTRIES,),
+    )
+    db.commit()
+
+
+def _close_answers_db() -> None:
+    """Close the answer store when the interpreter shuts down."""
+    if _answers_db is not None:
+        _answers_db.close()
+
+
+atexit.register(_close_answers_db)
+
+
+def lookup_answer(agent_name: str, user_id: str, query: str) -> Optional[str]:
+    """
+    Find the cached final answer of the same question asked by the same user.
+
+    Args:
+        agent_name: Agent the answer belongs to
+        user_id: User who asked the question (answers are never shared between users)
+        query: Raw user text
+
+    Returns:
+        The cached answer, or None on a miss or once expired
+    """
+    db = _open_answers_db()
+    if db is None:
+        return None
+    try:
+        row = db.execute(
+            "SELECT response FROM answers "
+            "WHERE agent = ? AND user_id = ? AND normalized = ? AND created_at >= ?",
+            (agent_name, user_id, normalize_query(query), time.time() - _ANSWER_CACHE_TTL),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def store_answer(agent_name: str, user_id: str, query: str, response: str) -> None:
+    """Record the final answer to `query` for this user."""
+    db = _open_answers_db()
+    if db is None:
+        return
+    global _answers_writes
+    try:
+        db.execute(
+            "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?)",
+            (agent_name, user_id, normalize_query(query), response, time.time()),
+        )
+        db.commit()
+        _answers_writes += 1
+        if _answers_writes % _PRUNE_EVERY == 0:
+            _prune_answers(db)
+    except sqlite3.Error:
+        pass  # Another process holds the lock: skip caching this answer
@@ -0,0 +1,4 @@
+import os
+
+# pytest imports the package (and so agents.py): never ping Ollama from tests
+os.environ.setdefault("PREWARM", "0")
@@ -0,0 +1,150 @@
+"""
+Tests for the answer-cache callbacks of the root agent (agents.py).
+"""
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from google.genai import types
+
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(_REPO_DIR))
+os.environ.setdefault("PREWARM", "0")
+
+_PACKAGE = os.path.basename(_REPO_DIR)
+agents = importlib.import_module(f"{_PACKAGE}.agents")
+cache = importlib.import_module(f"{_PACKAGE}.cache")
+
+
+def _message(role: str, text: str) -> types.Content:
+    return types.Content(parts=[types.Part(text=text)], role=role)
+
+
+def _context(*user_texts: str, user_id: str = "u1") -> SimpleNamespace:
+    """Callback context of the last message in `user_texts`, earlier ones being previous turns."""
+    events = []
+    for text in user_texts[:-1]:
+        events.append(SimpleNamespace(author="user", content=_message("user", text)))
+        events.append(SimpleNamespace(author="root_agent", content=_message("model", "...")))
+    events.append(SimpleNamespace(author="user", content=_message("user", user_texts[-1])))
+    return SimpleNamespace(
+        agent_name="root_agent",
+        user_id=user_id,
+        user_content=_message("user", user_texts[-1]),
+        session=SimpleNamespace(events=events),
+        state={},
+    )
+
+
+def _final_response(text: str) -> SimpleNamespace:
+    return SimpleNamespace(partial=False, content=_message("model", text))
+
+
+def _request(text: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        model="ollama_chat/test",
+        config=SimpleNamespace(system_instruction="Tu es un guide."),
+        contents=[_message("user", text)],
+    )
+
+
+class AnswerCacheCallbacksTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._saved_dir = cache._CACHE_DIR
+        cache._CACHE_DIR = self._tmp.name
+        self._reset()
+
+    def tearDown(self):
+        self._reset()
+        cache._CACHE_DIR = self._saved_dir
+        self._tmp.cleanup()
+
+    def _reset(self):
+        """Forget open sqlite connections and the in-memory LRU."""
+        cache._close_answers_db()
+        cache._answers_db = None
+        cache._answers_db_disabled = False
+        cache._close_responses_db()
+        cache._responses_db = None
+        cache._responses_db_disabled = False
+        cache._memory.clear()
+
+    def _run_turn(self, ctx: SimpleNamespace, answer: str):
+        """Play one invocation: lookup, a model reply stored through the LLM cache, then store."""
+        hit = agents.answer_cache_lookup(ctx)
+        if hit is not None:
+            return hit
+        ctx.state["temp:llm_cache_key"] = f"key-{answer}"
+        agents.cache_model_response(ctx, _final_response(answer))
+        agents.answer_cache_store(ctx)
+        return None
+
+    def test_query_and_final_text_go_through_temp_state(self):
+        ctx = _context("Jours fériés au Maroc ?")
+
+        self.assertIsNone(self._run_turn(ctx, "Liste des jours fériés..."))
+        self.assertEqual(ctx.state[agents._ANSWER_QUERY_KEY], "Jours fériés au Maroc ?")
+        self.assertEqual(ctx.state[agents._ANSWER_FINAL_KEY], "Liste des jours fériés...")
+        self.assertTrue(all(key.startswith("temp:") for key in ctx.state))
+
+        hit = agents.answer_cache_lookup(_context("jours feries au maroc"))
+        self.assertEqual(hit.parts[0].text, "Liste des jours fériés...")
+
+    def test_follow_up_after_different_first_turns_misses(self):
+        self._run_turn(_context("Jours fériés en France ?"), "Jours fériés français")
+        self._run_turn(_context("Jours fériés en France ?", "et en Allemagne ?"), "Jours fériés allemands")
+
+        ctx = _context("Bourses en informatique ?", "et en Allemagne ?")
+        self.assertIsNone(agents.answer_cache_lookup(ctx))
+        self.assertNotIn(agents._ANSWER_QUERY_KEY, ctx.state)
+        self.assertIsNone(cache.lookup_answer("root_agent", "u1", "et en Allemagne ?"))
+
+    def test_weather_tools_and_errors_are_not_cached(self):
+        cases = [
+            ("get_weather_tool", {"status": "success", "temperature": "20°C"}),
+            ("get_weather_many_tool", {"status": "success", "results": []}),
+            ("get_public_holidays_tool", {"status": "error", "error": "Unknown country"}),
+            ("search_city_info_tool", {"error": "timeout"}),
+        ]
+        for tool_name, response in cases:
+            with self.subTest(tool=tool_name):
+                question = f"Question pour {tool_name}"
+                ctx = _context(question)
+                agents.answer_cache_lookup(ctx)
+                agents.simple_after_tool_modifier(SimpleNamespace(name=tool_name), {}, ctx, response)
+                agents.cache_model_response(ctx, _final_response("réponse"))
+                ctx.state[agents._ANSWER_FINAL_KEY] = "réponse"
+                agents.answer_cache_store(ctx)
+
+                self.assertTrue(ctx.state[agents._ANSWER_SKIP_KEY])
+                self.assertIsNone(cache.lookup_answer("root_agent", "u1", question))
+
+    def test_successful_tool_keeps_answer_cacheable(self):
+        ctx = _context("Jours fériés au Maroc ?")
+        agents.answer_cache_lookup(ctx)
+        agents.simple_after_tool_modifier(
+            SimpleNamespace(name="get_public_holidays_tool"), {}, ctx, {"status": "success", "holidays": []}
+        )
+
+        self.assertNotIn(agents._ANSWER_SKIP_KEY, ctx.state)
+
+    def test_answer_is_stored_on_llm_cache_hit(self):
+        request = _request("Parle-moi de Rabat")
+        cache.store_response(cache.llm_cache_key("root_agent", request), "Rabat est la capitale.")
+
+        ctx = _context("Parle-moi de Rabat")
+        agents.answer_cache_lookup(ctx)
+        response = agents.simple_before_model_modifier(ctx, request)
+        agents.answer_cache_store(ctx)
+
+        self.assertEqual(response.content.parts[0].text, "Rabat est la capitale.")
+        self.assertEqual(cache.lookup_answer("root_agent", "u1", "Parle-moi de Rabat"), "Rabat est la capitale.")
+
+
+if __name__ == "__main__":
+    unittest.main()
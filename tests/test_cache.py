@@ -0,0 +1,162 @@
+"""
+Tests for the LLM response cache and the answer cache (cache.py).
+"""
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache  # noqa: E402
+
+
+class _FakeContent:
+    """Stand-in for google.genai types.Content (only model_dump is used)."""
+
+    def __init__(self, role: str, text: str):
+        self.role = role
+        self.text = text
+
+    def model_dump(self, **kwargs) -> dict:
+        return {"role": self.role, "parts": [{"text": self.text}]}
+
+
+def _request(text: str, model: str = "ollama_chat/test", system: str = "Tu es un guide.") -> SimpleNamespace:
+    return SimpleNamespace(
+        model=model,
+        config=SimpleNamespace(system_instruction=system),
+        contents=[_FakeContent("user", text)],
+    )
+
+
+class LlmResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._saved = (cache._CACHE_DIR, cache._MAX_ENTRIES, cache._MAX_DISK_ENTRIES, cache._LLM_CACHE_TTL)
+        cache._CACHE_DIR = self._tmp.name
+        self._reset()
+
+    def tearDown(self):
+        self._reset()
+        cache._CACHE_DIR, cache._MAX_ENTRIES, cache._MAX_DISK_ENTRIES, cache._LLM_CACHE_TTL = self._saved
+        self._tmp.cleanup()
+
+    def _reset(self):
+        """Forget the in-memory LRU and the open sqlite connection."""
+        cache._close_responses_db()
+        cache._responses_db = None
+        cache._responses_db_disabled = False
+        cache._memory.clear()
+
+    def test_key_is_stable_and_prompt_sensitive(self):
+        key = cache.llm_cache_key("city_info_agent", _request("Paris"))
+
+        self.assertEqual(key, cache.llm_cache_key("city_info_agent", _request("Paris")))
+        self.assertNotEqual(key, cache.llm_cache_key("city_info_agent", _request("Lyon")))
+        self.assertNotEqual(key, cache.llm_cache_key("weather_agent", _request("Paris")))
+        self.assertNotEqual(key, cache.llm_cache_key("city_info_agent", _request("Paris", model="other")))
+
+    def test_miss_then_hit(self):
+        key = cache.llm_cache_key("city_info_agent", _request("Paris"))
+        self.assertIsNone(cache.get_cached_response(key))
+
+        cache.store_response(key, "Paris est la capitale de la France.")
+        self.assertEqual(cache.get_cached_response(key), "Paris est la capitale de la France.")
+
+    def test_hit_survives_restart_through_sqlite(self):
+        cache.store_response("k", "réponse")
+        self._reset()
+
+        self.assertEqual(cache.get_cached_response("k"), "réponse")
+
+    def test_lru_evicts_least_recently_used(self):
+        cache._MAX_ENTRIES = 2
+        cache._responses_db_disabled = True  # In-memory LRU only
+
+        cache.store_response("a", "A")
+        cache.store_response("b", "B")
+        cache.get_cached_response("a")  # "b" becomes the least recently used
+        cache.store_response("c", "C")
+
+        self.assertEqual(cache.get_cached_response("a"), "A")
+        self.assertIsNone(cache.get_cached_response("b"))
+        self.assertEqual(cache.get_cached_response("c"), "C")
+
+    def test_disk_keeps_only_newest_entries(self):
+        cache._MAX_DISK_ENTRIES = 2
+        for key in ("a", "b", "c"):
+            cache.store_response(key, key.upper())
+        self._reset()
+
+        self.assertIsNone(cache.get_cached_response("a"))
+        self.assertEqual(cache.get_cached_response("c"), "C")
+
+    def test_expired_entries_are_misses(self):
+        cache.store_response("k", "réponse")
+        cache._LLM_CACHE_TTL = -1
+
+        self.assertIsNone(cache.get_cached_response("k"))
+        self._reset()
+        self.assertIsNone(cache.get_cached_response("k"))
+
+
+class AnswerCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._saved = (cache._CACHE_DIR, cache._MAX_ANSWER_ENTRIES, cache._ANSWER_CACHE_TTL)
+        cache._CACHE_DIR = self._tmp.name
+        self._reset()
+
+    def tearDown(self):
+        self._reset()
+        cache._CACHE_DIR, cache._MAX_ANSWER_ENTRIES, cache._ANSWER_CACHE_TTL = self._saved
+        self._tmp.cleanup()
+
+    def _reset(self):
+        """Forget the open sqlite connection."""
+        cache._close_answers_db()
+        cache._answers_db = None
+        cache._answers_db_disabled = False
+
+    def test_normalize_keeps_word_order(self):
+        self.assertEqual(cache.normalize_query("  Météo à PARIS ?! "), "meteo a paris")
+        self.assertNotEqual(
+            cache.normalize_query("Météo à Paris, pas à Lyon"),
+            cache.normalize_query("Météo à Lyon, pas à Paris"),
+        )
+
+    def test_hit_on_same_question_from_same_user(self):
+        cache.store_answer("root_agent", "u1", "Jours fériés au Maroc ?", "Liste des jours fériés...")
+
+        self.assertEqual(
+            cache.lookup_answer("root_agent", "u1", "jours feries au maroc"), "Liste des jours fériés..."
+        )
+        self.assertIsNone(cache.lookup_answer("root_agent", "u1", "Jours fériés en France ?"))
+
+    def test_answers_are_not_shared_between_users(self):
+        cache.store_answer("root_agent", "u1", "Bourses en France", "Réponse pour u1")
+
+        self.assertIsNone(cache.lookup_answer("root_agent", "u2", "Bourses en France"))
+
+    def test_expired_answers_are_misses(self):
+        cache.store_answer("root_agent", "u1", "Bourses en France", "Réponse")
+        cache._ANSWER_CACHE_TTL = -1
+
+        self.assertIsNone(cache.lookup_answer("root_agent", "u1", "Bourses en France"))
+
+    def test_store_keeps_only_newest_answers(self):
+        cache._MAX_ANSWER_ENTRIES = 2
+        for query in ("a", "b", "c"):
+            cache.store_answer("root_agent", "u1", query, query.upper())
+        self._reset()  # Pruning runs when the store opens
+
+        self.assertIsNone(cache.lookup_answer("root_agent", "u1", "a"))
+        self.assertEqual(cache.lookup_answer("root_agent", "u1", "c"), "C")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for scholarship ranking (tools.py).
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tools  # noqa: E402
+
+
+class AmountKeyTest(unittest.TestCase):
+
+    def test_full_funding_ranks_above_full_tuition_with_extras_above_full_tuition(self):
+        ordered = [
+            "Full funding + stipend",
+            "Full tuition + living expenses",
+            "Full tuition",
+            "$50,000 grant",
+        ]
+        scores = [tools._amount_key(amount) for amount in ordered]
+
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(len(set(scores)), len(scores))
+
+    def test_amount_values(self):
+        cases = [
+            ("€1,700/month + tuition", 1700),
+            ("Up to €30,000", 30000),
+            ("€5,000-10,000/year", 5000),
+            ("Partial to full tuition", 0),
+            ("Rolling", 0),
+            ("", 0),
+            (None, 0),
+            (5000, 5000),
+            (1234.5, 1234),
+        ]
+        for amount, expected in cases:
+            with self.subTest(amount=amount):
+                self.assertEqual(tools._amount_key(amount), expected)
+
+    def test_full_tuition_is_case_insensitive(self):
+        self.assertEqual(tools._amount_key("full TUITION"), tools._amount_key("Full tuition"))
+
+
+class RankScholarshipsTest(unittest.TestCase):
+
+    def test_ranks_best_funded_first(self):
+        scholarships = [
+            {"name": "DAAD", "amount": "€934/month"},
+            {"name": "Fulbright", "amount": "Full funding"},
+            {"name": "Erasmus", "amount": "€25,000/year + tuition"},
+            {"name": "Chevening", "amount": "Full tuition + £1,200/month"},
+        ]
+
+        ranked = tools.rank_scholarships(scholarships, top_k=4)
+
+        self.assertEqual([s["name"] for s in ranked], ["Fulbright", "Chevening", "Erasmus", "DAAD"])
+
+    def test_top_k(self):
+        scholarships = [{"name": str(i), "amount": str(i * 100)} for i in range(10)]
+
+        for top_k, expected in [(3, ["9", "8", "7"]), (1, ["9"]), (0, []), (20, [str(i) for i in range(9, -1, -1)])]:
+            with self.subTest(top_k=top_k):
+                self.assertEqual([s["name"] for s in tools.rank_scholarships(scholarships, top_k=top_k)], expected)
+
+    def test_tolerates_numeric_missing_and_non_dict_entries(self):
+        scholarships = [
+            {"name": "numeric", "amount": 5000},
+            {"name": "none", "amount": None},
+            {"name": "missing"},
+            "not a scholarship",
+            None,
+            ["nested"],
+            {"name": "text", "amount": "$7,000"},
+        ]
+
+        ranked = tools.rank_scholarships(scholarships, top_k=10)
+
+        self.assertEqual([s["name"] for s in ranked], ["text", "numeric", "none", "missing"])
+
+    def test_mock_fallback_ranks_full_scholarships_first(self):
+        ranked = tools.rank_scholarships(tools._get_mock_scholarships("Morocco", "CS", "master"))
+
+        self.assertEqual(
+            [s["name"] for s in ranked],
+            ["Fulbright Morocco Scholarship", "Chevening Scholarship", "Turkish Government Scholarship"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
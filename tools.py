@@ -2,13 +2,85 @@
 Tools module for multi-agent AI system.
 Implements tools that can be used by sub-agents.
 """
+import asyncio
+import atexit
+import functools
 import os
-import requests
+import re
+import time
+import unicodedata
+import httpx
+import orjson
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List
-from . import config
 
 
-def search_city_info(city: str) -> dict:
+try:
+    import h2  # noqa: F401  (optional, enables HTTP/2 in httpx)
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+# Shared async HTTP client: keeps connections alive across tool calls so that
+# concurrent tool invocations can overlap their network I/O. With HTTP/2, the
+# Open-Meteo geocode and forecast requests multiplex over pooled TLS connections.
+_CLIENT = httpx.AsyncClient(
+    http2=_HTTP2_AVAILABLE,
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+)
+
+
+def _close_client() -> None:
+    """Close the shared HTTP client when the interpreter shuts down."""
+    if _CLIENT.is_closed:
+        return
+    try:
+        asyncio.run(_CLIENT.aclose())
+    except RuntimeError:
+        # An event loop is still running; the OS will reclaim the sockets.
+        pass
+
+
+atexit.register(_close_client)
+
+
+def _async_ttl_cache(ttl: float, maxsize: int):
+    """
+    Cache the results of a coroutine function for `ttl` seconds.
+    
+    Results are keyed on the positional arguments; exceptions are not cached.
+    Up to `maxsize` entries are kept, least recently used first out.
+    """
+    def decorator(func):
+        cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        
+        @functools.wraps(func)
+        async def wrapper(*args):
+            now = time.monotonic()
+            entry = cache.get(args)
+            if entry is not None and now - entry[0] < ttl:
+                cache.move_to_end(args)
+                return entry[1]
+            
+            result = await func(*args)
+            cache[args] = (now, result)
+            cache.move_to_end(args)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return result
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+# Holidays and city coordinates are static over a day
+_STATIC_DATA_TTL = 24 * 60 * 60
+
+
+async def search_city_info(city: str) -> dict:
     """
     Search for information about a city using Tavily API.
     
@@ -33,9 +105,9 @@ def search_city_info(city: str) -> dict:
             "max_results": 5
         }
         
-        response = requests.post(url, json=payload, timeout=15)
+        response = await _CLIENT.post(url, json=payload, timeout=15)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Extract the answer and sources
         result = {
@@ -54,53 +126,238 @@ def search_city_info(city: str) -> dict:
         
         return result
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         return {"error": f"Tavily API error: {str(e)}", "city": city}
     except Exception as e:
         return {"error": f"Unexpected error: {str(e)}", "city": city}
 
 
-def get_public_holidays(country_code: str, year: int = 2025) -> List[dict]:
+# Country name (English / French, lowercase, no accents) -> ISO 3166-1 alpha-2
+_COUNTRY_TO_ISO2 = {
+    "morocco": "MA", "maroc": "MA",
+    "france": "FR",
+    "usa": "US", "us": "US", "united states": "US", "etats-unis": "US", "etats unis": "US",
+    "uk": "GB", "united kingdom": "GB", "royaume-uni": "GB", "royaume uni": "GB",
+    "england": "GB", "angleterre": "GB", "great britain": "GB",
+    "germany": "DE", "allemagne": "DE",
+    "spain": "ES", "espagne": "ES",
+    "italy": "IT", "italie": "IT",
+    "portugal": "PT",
+    "belgium": "BE", "belgique": "BE",
+    "netherlands": "NL", "pays-bas": "NL", "pays bas": "NL",
+    "switzerland": "CH", "suisse": "CH",
+    "austria": "AT", "autriche": "AT",
+    "ireland": "IE", "irlande": "IE",
+    "sweden": "SE", "suede": "SE",
+    "norway": "NO", "norvege": "NO",
+    "denmark": "DK", "danemark": "DK",
+    "finland": "FI", "finlande": "FI",
+    "poland": "PL", "pologne": "PL",
+    "greece": "GR", "grece": "GR",
+    "turkey": "TR", "turkiye": "TR", "turquie": "TR",
+    "canada": "CA",
+    "mexico": "MX", "mexique": "MX",
+    "brazil": "BR", "bresil": "BR",
+    "argentina": "AR", "argentine": "AR",
+    "japan": "JP", "japon": "JP",
+    "china": "CN", "chine": "CN",
+    "south korea": "KR", "korea": "KR", "coree du sud": "KR",
+    "australia": "AU", "australie": "AU",
+    "new zealand": "NZ", "nouvelle-zelande": "NZ",
+    "egypt": "EG", "egypte": "EG",
+    "tunisia": "TN", "tunisie": "TN",
+    "south africa": "ZA", "afrique du sud": "ZA",
+    "nigeria": "NG",
+    "kenya": "KE",
+    "russia": "RU", "russie": "RU",
+    "ukraine": "UA",
+}
+
+
+_NAGER_URL = "https://date.nager.at/api/v3"
+
+
+def _normalize_country(name: str) -> str:
+    """Lowercase and strip accents so 'États-Unis' matches 'etats-unis'."""
+    normalized = unicodedata.normalize("NFKD", name.strip().lower())
+    return "".join(c for c in normalized if not unicodedata.combining(c))
+
+
+@_async_ttl_cache(ttl=_STATIC_DATA_TTL, maxsize=1)
+async def _nager_countries() -> Dict[str, str]:
+    """Fetch the countries supported by Nager.Date as {normalized English name: ISO2 code}."""
+    response = await _CLIENT.get(f"{_NAGER_URL}/AvailableCountries")
+    response.raise_for_status()
+    return {
+        _normalize_country(country["name"]): country["countryCode"]
+        for country in orjson.loads(response.content)
+    }
+
+
+async def _resolve_country_code(country: str) -> str:
+    """
+    Map a country name (or an ISO2 code) to its ISO 3166-1 alpha-2 code.
+    
+    The static table covers French names; any other English name is looked up
+    in Nager.Date's own country list. Unknown input is passed through upper-cased.
+    """
+    normalized = _normalize_country(country)
+    if normalized in _COUNTRY_TO_ISO2:
+        return _COUNTRY_TO_ISO2[normalized]
+    
+    try:
+        nager_countries = await _nager_countries()
+    except Exception:
+        nager_countries = {}
+    return nager_countries.get(normalized, country.strip().upper())
+
+
+@_async_ttl_cache(ttl=_STATIC_DATA_TTL, maxsize=256)
+async def _holidays_for(year: int, country_code: str) -> tuple:
+    """
+    Fetch and format the public holidays of a country.
+    
+    The result is cached and shared between callers: the tuple cannot grow or
+    shrink, but its dicts are mutable, so callers must copy them before editing.
+    """
+    url = f"{_NAGER_URL}/publicholidays/{year}/{country_code}"
+    
+    response = await _CLIENT.get(url)
+    response.raise_for_status()
+    
+    holidays = orjson.loads(response.content)
+    
+    # Format the holidays for better readability
+    return tuple(
+        {
+            "date": holiday.get("date", ""),
+            "name": holiday.get("localName", holiday.get("name", "")),
+            "name_english": holiday.get("name", ""),
+            "fixed": holiday.get("fixed", False),
+            "type": ", ".join(holiday.get("types", []))
+        }
+        for holiday in holidays
+    )
+
+
+async def get_public_holidays(country: str, year: int = 2025) -> List[dict]:
     """
     Get public holidays for a country using Nager.Date API (free, no API key).
     
     Args:
-        country_code: ISO 3166-1 alpha-2 country code (e.g., 'MA' for Morocco, 'FR' for France, 'US' for USA)
+        country: Country name in English or French (e.g., 'Morocco', 'Maroc')
+            or ISO 3166-1 alpha-2 code (e.g., 'MA')
         year: Year to get holidays for (default: 2025)
         
     Returns:
         List of public holidays with date, name, and type
     """
     try:
-        url = f"https://date.nager.at/api/v3/publicholidays/{year}/{country_code.upper()}"
-        
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        holidays = response.json()
-        
-        # Format the holidays for better readability
-        result = []
-        for holiday in holidays:
-            result.append({
-                "date": holiday.get("date", ""),
-                "name": holiday.get("localName", holiday.get("name", "")),
-                "name_english": holiday.get("name", ""),
-                "fixed": holiday.get("fixed", False),
-                "type": ", ".join(holiday.get("types", []))
-            })
+        country_code = await _resolve_country_code(country)
+        # Copy each entry so callers can never alter the cached holidays
+        return [dict(holiday) for holiday in await _holidays_for(year, country_code)]
         
-        return result
-        
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
-            return [{"error": f"Country code '{country_code}' not found. Use ISO 3166-1 alpha-2 codes like: MA (Morocco), FR (France), US (USA), DE (Germany), GB (UK), JP (Japan)"}]
+            return [{"error": f"Country '{country}' not found. Use a country name or ISO 3166-1 alpha-2 codes like: MA (Morocco), FR (France), US (USA), DE (Germany), GB (UK), JP (Japan)"}]
         return [{"error": f"HTTP error: {str(e)}"}]
     except Exception as e:
         return [{"error": f"Unexpected error: {str(e)}"}]
 
 
-def get_weather(city: str) -> dict:
+_GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+_WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
+
+# WMO weather code -> (condition, description)
+_WMO_CODES = {
+    0: ("Clear", "Clear sky"),
+    1: ("Mostly Clear", "Mainly clear"),
+    2: ("Partly Cloudy", "Partly cloudy"),
+    3: ("Cloudy", "Overcast"),
+    45: ("Foggy", "Fog"),
+    48: ("Foggy", "Depositing rime fog"),
+    51: ("Light Drizzle", "Light drizzle"),
+    53: ("Drizzle", "Moderate drizzle"),
+    55: ("Heavy Drizzle", "Dense drizzle"),
+    61: ("Light Rain", "Slight rain"),
+    63: ("Rain", "Moderate rain"),
+    65: ("Heavy Rain", "Heavy rain"),
+    71: ("Light Snow", "Slight snow"),
+    73: ("Snow", "Moderate snow"),
+    75: ("Heavy Snow", "Heavy snow"),
+    80: ("Light Showers", "Slight rain showers"),
+    81: ("Showers", "Moderate rain showers"),
+    82: ("Heavy Showers", "Violent rain showers"),
+    95: ("Thunderstorm", "Thunderstorm"),
+    96: ("Thunderstorm", "Thunderstorm with slight hail"),
+    99: ("Severe Thunderstorm", "Thunderstorm with heavy hail"),
+}
+
+
+@_async_ttl_cache(ttl=_STATIC_DATA_TTL, maxsize=512)
+async def _geocode(city: str) -> Optional[tuple]:
+    """Resolve a city name to (latitude, longitude, city_name, country), or None if unknown."""
+    geocode_params = {"name": city, "count": 1, "language": "en"}
+    
+    geo_response = await _CLIENT.get(_GEOCODE_URL, params=geocode_params)
+    geo_response.raise_for_status()
+    geo_data = orjson.loads(geo_response.content)
+    
+    if "results" not in geo_data or len(geo_data["results"]) == 0:
+        return None
+    
+    first = geo_data["results"][0]
+    return first["latitude"], first["longitude"], first["name"], first.get("country", "")
+
+
+async def _fetch_current_weather(lat: float, lon: float) -> dict:
+    """Fetch the raw 'current' block of the Open-Meteo forecast for a location."""
+    weather_params = {
+        "latitude": lat,
+        "longitude": lon,
+        "current": "temperature_2m,weather_code,wind_speed_10m,relative_humidity_2m",
+        "timezone": "auto"
+    }
+    
+    weather_response = await _CLIENT.get(_WEATHER_URL, params=weather_params)
+    weather_response.raise_for_status()
+    return orjson.loads(weather_response.content).get("current", {})
+
+
+def _format_weather(city_name: str, country: str, current: dict) -> dict:
+    """Build the tool response from an Open-Meteo 'current' block."""
+    temp = current.get("temperature_2m", 0)
+    weather_code = current.get("weather_code", 0)
+    wind = current.get("wind_speed_10m", 0)
+    humidity = current.get("relative_humidity_2m", 0)
+    
+    # Convert weather code to condition
+    condition, description = _get_weather_description(weather_code)
+    
+    return {
+        "city": city_name,
+        "country": country,
+        "temperature": temp,
+        "temperature_unit": "°C",
+        "condition": condition,
+        "description": description,
+        "wind_speed": wind,
+        "wind_unit": "km/h",
+        "humidity": humidity
+    }
+
+
+def _weather_fallback(city: str, error: Exception) -> dict:
+    """Fallback to mock data if the API fails."""
+    return {
+        "city": city,
+        "temperature": 20,
+        "condition": "Unknown",
+        "description": f"Could not fetch weather: {str(error)}"
+    }
+
+
+async def get_weather(city: str) -> dict:
     """
     Get current weather data for a city using Open-Meteo API (free, no API key).
     
@@ -112,94 +369,69 @@ def get_weather(city: str) -> dict:
     """
     try:
         # Step 1: Get coordinates from city name using Open-Meteo Geocoding
-        geocode_url = "https://geocoding-api.open-meteo.com/v1/search"
-        geocode_params = {"name": city, "count": 1, "language": "en"}
-        
-        geo_response = requests.get(geocode_url, params=geocode_params, timeout=10)
-        geo_response.raise_for_status()
-        geo_data = geo_response.json()
-        
-        if "results" not in geo_data or len(geo_data["results"]) == 0:
+        location = await _geocode(city)
+        if location is None:
             return {"error": f"City '{city}' not found"}
-        
-        lat = geo_data["results"][0]["latitude"]
-        lon = geo_data["results"][0]["longitude"]
-        city_name = geo_data["results"][0]["name"]
-        country = geo_data["results"][0].get("country", "")
+        lat, lon, city_name, country = location
         
         # Step 2: Get weather data
-        weather_url = "https://api.open-meteo.com/v1/forecast"
-        weather_params = {
-            "latitude": lat,
-            "longitude": lon,
-            "current": "temperature_2m,weather_code,wind_speed_10m,relative_humidity_2m",
-            "timezone": "auto"
-        }
-        
-        weather_response = requests.get(weather_url, params=weather_params, timeout=10)
-        weather_response.raise_for_status()
-        weather_data = weather_response.json()
-        
-        current = weather_data.get("current", {})
-        temp = current.get("temperature_2m", 0)
-        weather_code = current.get("weather_code", 0)
-        wind = current.get("wind_speed_10m", 0)
-        humidity = current.get("relative_humidity_2m", 0)
-        
-        # Convert weather code to condition
-        condition, description = _get_weather_description(weather_code)
-        
-        return {
-            "city": city_name,
-            "country": country,
-            "temperature": temp,
-            "temperature_unit": "°C",
-            "condition": condition,
-            "description": description,
-            "wind_speed": wind,
-            "wind_unit": "km/h",
-            "humidity": humidity
-        }
+        current = await _fetch_current_weather(lat, lon)
+        return _format_weather(city_name, country, current)
         
     except Exception as e:
-        # Fallback to mock data if API fails
-        return {
-            "city": city,
-            "temperature": 20,
-            "condition": "Unknown",
-            "description": f"Could not fetch weather: {str(e)}"
-        }
+        return _weather_fallback(city, e)
+
+
+async def get_weather_many(cities: List[str]) -> List[dict]:
+    """
+    Get current weather data for several cities at once.
+    
+    All geocoding requests are sent concurrently, then all forecast requests,
+    so the total latency is about two round-trips whatever the number of cities.
+    
+    Args:
+        cities: Names of the cities
+        
+    Returns:
+        One weather entry per city, in the same order as `cities`
+    """
+    locations = await asyncio.gather(
+        *[_geocode(city) for city in cities], return_exceptions=True
+    )
+    
+    found = [
+        (index, location) for index, location in enumerate(locations)
+        if location is not None and not isinstance(location, Exception)
+    ]
+    forecasts = await asyncio.gather(
+        *[_fetch_current_weather(location[0], location[1]) for _, location in found],
+        return_exceptions=True
+    )
+    
+    results: List[dict] = []
+    for city, location in zip(cities, locations):
+        if isinstance(location, Exception):
+            results.append(_weather_fallback(city, location))
+        elif location is None:
+            results.append({"error": f"City '{city}' not found"})
+        else:
+            results.append({})  # Filled in from the forecasts below
+    
+    for (index, location), current in zip(found, forecasts):
+        if isinstance(current, Exception):
+            results[index] = _weather_fallback(cities[index], current)
+        else:
+            results[index] = _format_weather(location[2], location[3], current)
+    
+    return results
 
 
 def _get_weather_description(code: int) -> tuple:
     """Convert WMO weather code to human-readable condition."""
-    weather_codes = {
-        0: ("Clear", "Clear sky"),
-        1: ("Mostly Clear", "Mainly clear"),
-        2: ("Partly Cloudy", "Partly cloudy"),
-        3: ("Cloudy", "Overcast"),
-        45: ("Foggy", "Fog"),
-        48: ("Foggy", "Depositing rime fog"),
-        51: ("Light Drizzle", "Light drizzle"),
-        53: ("Drizzle", "Moderate drizzle"),
-        55: ("Heavy Drizzle", "Dense drizzle"),
-        61: ("Light Rain", "Slight rain"),
-        63: ("Rain", "Moderate rain"),
-        65: ("Heavy Rain", "Heavy rain"),
-        71: ("Light Snow", "Slight snow"),
-        73: ("Snow", "Moderate snow"),
-        75: ("Heavy Snow", "Heavy snow"),
-        80: ("Light Showers", "Slight rain showers"),
-        81: ("Showers", "Moderate rain showers"),
-        82: ("Heavy Showers", "Violent rain showers"),
-        95: ("Thunderstorm", "Thunderstorm"),
-        96: ("Thunderstorm", "Thunderstorm with slight hail"),
-        99: ("Severe Thunderstorm", "Thunderstorm with heavy hail"),
-    }
-    return weather_codes.get(code, ("Unknown", "Unknown conditions"))
+    return _WMO_CODES.get(code, ("Unknown", "Unknown conditions"))
 
 
-def search_scholarships(country: str, field: str, level: str) -> List[dict]:
+async def search_scholarships(country: str, field: str, level: str) -> List[dict]:
     """
     Search for scholarships using the Scholarships API with fallback mock data.
     
@@ -209,8 +441,9 @@ def search_scholarships(country: str, field: str, level: str) -> List[dict]:
         level: Study level (bachelor, master, phd)
     
     Returns:
-        List of matching scholarships
+        Top matching scholarships, already ranked by amount (largest first)
     """
+    scholarships: Optional[List[dict]] = None
     try:
         # Call the real Scholarships API || not working at the moment 
         url = "https://scholarshipsapi.com/search"
@@ -219,60 +452,107 @@ def search_scholarships(country: str, field: str, level: str) -> List[dict]:
             "level": level.lower()
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = await _CLIENT.get(url, params=params)
         response.raise_for_status()
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
-        # Return the scholarships from the API
+        # Use the scholarships from the API
         if isinstance(data, list) and len(data) > 0:
-            return data
-        elif isinstance(data, dict) and "scholarships" in data:
-            return data["scholarships"]
+            scholarships = data
+        elif isinstance(data, dict) and isinstance(data.get("scholarships"), list):
+            scholarships = data["scholarships"]
             
     except Exception:
         pass  # Fall through to mock data
     
-    # Fallback: Return mock scholarships based on country
-    return _get_mock_scholarships(country, field, level)
+    # Fallback: Use mock scholarships based on country
+    if scholarships is None:
+        scholarships = _get_mock_scholarships(country, field, level)
+    
+    # Rank once here so downstream agents get a short, pre-sorted list
+    return rank_scholarships(scholarships, top_k=5)
 
 
-def _get_mock_scholarships(country: str, field: str, level: str) -> List[dict]:
-    """Fallback mock scholarship data."""
-    country_lower = country.lower()
-    
-    # Country-specific scholarships
-    scholarships = {
-        "france": [
-            {"name": "Eiffel Excellence Scholarship", "amount": "€1,700/month + tuition", "deadline": "January 10, 2025", "requirements": "Under 25 for Master's, excellent academics", "description": "French government scholarship for international students"},
-            {"name": "Émile Boutmy Scholarship (Sciences Po)", "amount": "€5,000-10,000/year", "deadline": "February 23, 2025", "requirements": "Non-EU, excellent academic record", "description": "For undergraduate and master's students at Sciences Po Paris"},
-            {"name": "ENS Paris-Saclay International Scholarship", "amount": "€1,000/month", "deadline": "December 1, 2024", "requirements": "Master's level, research focus", "description": "For international students in sciences"},
-            {"name": "HEC Paris MBA Scholarship", "amount": "Up to €30,000", "deadline": "Rolling", "requirements": "MBA admission, leadership experience", "description": "Merit-based scholarship for MBA students"},
-            {"name": "INSEAD Scholarship", "amount": "€10,000-50,000", "deadline": "Rolling", "requirements": "MBA/Master's admission", "description": "Various scholarships for INSEAD programs"},
-        ],
-        "qatar": [
-            {"name": "Qatar Foundation Scholarship", "amount": "Full tuition + living expenses", "deadline": "February 28, 2025", "requirements": "Excellent academics, leadership", "description": "For international students studying in Qatar"},
-            {"name": "Hamad Bin Khalifa University Scholarship", "amount": "Full funding + stipend", "deadline": "March 1, 2025", "requirements": "Admission to HBKU program", "description": "For graduate studies at HBKU"},
-            {"name": "Qatar National Research Fund", "amount": "$50,000 grant", "deadline": "April 30, 2025", "requirements": "Research proposal, PhD level", "description": "For doctoral research in Qatar"},
-            {"name": "Texas A&M Qatar Scholarship", "amount": "Full tuition", "deadline": "January 15, 2025", "requirements": "Engineering students", "description": "For engineering programs at Texas A&M Qatar"},
-            {"name": "Carnegie Mellon Qatar Scholarship", "amount": "Partial to full tuition", "deadline": "January 1, 2025", "requirements": "CS/Business admission", "description": "Merit-based for CMU Qatar students"},
-        ],
-        "morocco": [
-            {"name": "Fulbright Morocco Scholarship", "amount": "Full funding", "deadline": "February 1, 2025", "requirements": "Moroccan citizen, leadership", "description": "US government scholarship for graduate studies"},
-            {"name": "Chevening Scholarship", "amount": "Full tuition + £1,200/month", "deadline": "November 7, 2025", "requirements": "2+ years work experience", "description": "UK government scholarship"},
-            {"name": "DAAD Germany Scholarship", "amount": "€934/month", "deadline": "October 15, 2025", "requirements": "Good academics, English/German", "description": "German Academic Exchange Service"},
-            {"name": "Erasmus Mundus", "amount": "€25,000/year + tuition", "deadline": "January 15, 2025", "requirements": "Bachelor's degree", "description": "EU-funded scholarship"},
-            {"name": "Turkish Government Scholarship", "amount": "Full tuition + stipend", "deadline": "February 20, 2025", "requirements": "Under 30 for Master's", "description": "Türkiye Bursları scholarship"},
-        ]
-    }
+_AMOUNT_PATTERN = re.compile(r"(\d[\d,]*)")
+_FULL_FUNDING_PATTERN = re.compile(r"^\s*full\s+(funding|tuition)", re.IGNORECASE)
+# Above any numeric amount: a fully funded scholarship is always the best-funded
+_FULL_FUNDING_SCORE = 10 ** 12
+
+
+def _amount_key(amount: Any) -> int:
+    """
+    Score an amount string for ranking, higher is better.
     
-    # General international scholarships as default
-    default_scholarships = [
-        {"name": "Erasmus Mundus Joint Masters", "amount": "€25,000/year + tuition", "deadline": "January 15, 2025", "requirements": "Bachelor's degree, English proficiency", "description": "EU-funded scholarship for international students"},
-        {"name": "Chevening Scholarship UK", "amount": "Full tuition + £1,200/month", "deadline": "November 7, 2025", "requirements": "2+ years work experience, leadership", "description": "UK government's global scholarship"},
-        {"name": "DAAD Scholarship Germany", "amount": "€934/month + insurance", "deadline": "October 15, 2025", "requirements": "Good academic record", "description": "German Academic Exchange Service"},
-        {"name": "Fulbright Foreign Student Program", "amount": "Full funding", "deadline": "February 1, 2025", "requirements": "Bachelor's degree, leadership", "description": "US government scholarship"},
-        {"name": "Swiss Government Excellence Scholarship", "amount": "CHF 1,920/month", "deadline": "December 2024", "requirements": "Research proposal", "description": "For doctoral research in Switzerland"},
-    ]
+    'Full funding' ranks first, then 'Full tuition + ...' (tuition plus extras),
+    then plain 'Full tuition'; other amounts score their first number
+    (e.g. '€1,700/month' -> 1700), or 0 if there is none.
+    """
+    # API data may hold numbers or None: coerce to text first
+    amount = str(amount or "")
+    match = _FULL_FUNDING_PATTERN.match(amount)
+    if match:
+        if match.group(1).lower() == "funding":
+            return _FULL_FUNDING_SCORE + 2
+        return _FULL_FUNDING_SCORE + (1 if "+" in amount else 0)
     
-    return scholarships.get(country_lower, default_scholarships)
+    match = _AMOUNT_PATTERN.search(amount)
+    return int(match.group(1).replace(",", "")) if match else 0
+
+
+def rank_scholarships(scholarships: List[dict], top_k: int = 3) -> List[dict]:
+    """
+    Rank scholarships by amount, largest first.
+    
+    Args:
+        scholarships: Scholarships as returned by search_scholarships
+        top_k: Number of scholarships to keep
+    
+    Returns:
+        The `top_k` best-funded scholarships (entries that are not dicts are skipped)
+    """
+    return sorted(
+        (s for s in scholarships if isinstance(s, dict)),
+        key=lambda s: _amount_key(s.get("amount")),
+        reverse=True
+    )[:top_k]
+
+
+# Fallback data (read-only): country-specific scholarships
+_MOCK_SCHOLARSHIPS = {
+    "france": (
+        {"name": "Eiffel Excellence Scholarship", "amount": "€1,700/month + tuition", "deadline": "January 10, 2025", "requirements": "Under 25 for Master's, excellent academics", "description": "French government scholarship for international students"},
+        {"name": "Émile Boutmy Scholarship (Sciences Po)", "amount": "€5,000-10,000/year", "deadline": "February 23, 2025", "requirements": "Non-EU, excellent academic record", "description": "For undergraduate and master's students at Sciences Po Paris"},
+        {"name": "ENS Paris-Saclay International Scholarship", "amount": "€1,000/month", "deadline": "December 1, 2024", "requirements": "Master's level, research focus", "description": "For international students in sciences"},
+        {"name": "HEC Paris MBA Scholarship", "amount": "Up to €30,000", "deadline": "Rolling", "requirements": "MBA admission, leadership experience", "description": "Merit-based scholarship for MBA students"},
+        {"name": "INSEAD Scholarship", "amount": "€10,000-50,000", "deadline": "Rolling", "requirements": "MBA/Master's admission", "description": "Various scholarships for INSEAD programs"},
+    ),
+    "qatar": (
+        {"name": "Qatar Foundation Scholarship", "amount": "Full tuition + living expenses", "deadline": "February 28, 2025", "requirements": "Excellent academics, leadership", "description": "For international students studying in Qatar"},
+        {"name": "Hamad Bin Khalifa University Scholarship", "amount": "Full funding + stipend", "deadline": "March 1, 2025", "requirements": "Admission to HBKU program", "description": "For graduate studies at HBKU"},
+        {"name": "Qatar National Research Fund", "amount": "$50,000 grant", "deadline": "April 30, 2025", "requirements": "Research proposal, PhD level", "description": "For doctoral research in Qatar"},
+        {"name": "Texas A&M Qatar Scholarship", "amount": "Full tuition", "deadline": "January 15, 2025", "requirements": "Engineering students", "description": "For engineering programs at Texas A&M Qatar"},
+        {"name": "Carnegie Mellon Qatar Scholarship", "amount": "Partial to full tuition", "deadline": "January 1, 2025", "requirements": "CS/Business admission", "description": "Merit-based for CMU Qatar students"},
+    ),
+    "morocco": (
+        {"name": "Fulbright Morocco Scholarship", "amount": "Full funding", "deadline": "February 1, 2025", "requirements": "Moroccan citizen, leadership", "description": "US government scholarship for graduate studies"},
+        {"name": "Chevening Scholarship", "amount": "Full tuition + £1,200/month", "deadline": "November 7, 2025", "requirements": "2+ years work experience", "description": "UK government scholarship"},
+        {"name": "DAAD Germany Scholarship", "amount": "€934/month", "deadline": "October 15, 2025", "requirements": "Good academics, English/German", "description": "German Academic Exchange Service"},
+        {"name": "Erasmus Mundus", "amount": "€25,000/year + tuition", "deadline": "January 15, 2025", "requirements": "Bachelor's degree", "description": "EU-funded scholarship"},
+        {"name": "Turkish Government Scholarship", "amount": "Full tuition + stipend", "deadline": "February 20, 2025", "requirements": "Under 30 for Master's", "description": "Türkiye Bursları scholarship"},
+    )
+}
+
+# General international scholarships as default
+_DEFAULT_SCHOLARSHIPS = (
+    {"name": "Erasmus Mundus Joint Masters", "amount": "€25,000/year + tuition", "deadline": "January 15, 2025", "requirements": "Bachelor's degree, English proficiency", "description": "EU-funded scholarship for international students"},
+    {"name": "Chevening Scholarship UK", "amount": "Full tuition + £1,200/month", "deadline": "November 7, 2025", "requirements": "2+ years work experience, leadership", "description": "UK government's global scholarship"},
+    {"name": "DAAD Scholarship Germany", "amount": "€934/month + insurance", "deadline": "October 15, 2025", "requirements": "Good academic record", "description": "German Academic Exchange Service"},
+    {"name": "Fulbright Foreign Student Program", "amount": "Full funding", "deadline": "February 1, 2025", "requirements": "Bachelor's degree, leadership", "description": "US government scholarship"},
+    {"name": "Swiss Government Excellence Scholarship", "amount": "CHF 1,920/month", "deadline": "December 2024", "requirements": "Research proposal", "description": "For doctoral research in Switzerland"},
+)
+
+
+def _get_mock_scholarships(country: str, field: str, level: str) -> List[dict]:
+    """Fallback mock scholarship data."""
+    return list(_MOCK_SCHOLARSHIPS.get(country.lower(), _DEFAULT_SCHOLARSHIPS))